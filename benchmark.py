@@ -0,0 +1,325 @@
+import csv
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from zipfile import ZipFile
+
+from src.ContentExtractor import ContentExtractor
+from src.utils.functions import setup_output_csv, remove_intermediate
+from src.utils.colors import *
+
+
+
+#Path to the directory containing the input PDFs the golden CSV was produced from
+input_folder_path = './res'
+#Path to the committed fixture corpus of recorded outputs of the API (built by main.py --record)
+recorded_folder_path = './tests/golden/recorded'
+#Path to the read-only golden CSV that every performance mode is compared against. It must never
+#be the output path of main.py, otherwise a run of main.py silently replaces the reference
+golden_file_path = './tests/golden/result.csv'
+#Path to the directory where the CSV produced by each performance mode will be saved
+benchmark_folder_path = './bench'
+
+#Content extractors to be benchmarked, keyed by the name of the performance mode. Every mode,
+#'baseline' included, is only accepted if it reproduces every value of the golden CSV
+performance_modes = {
+    'baseline': ContentExtractor,
+}
+
+#Stages of the pipeline which are timed and memory profiled separately
+stages = ['unzip', 'load', 'extract', 'save']
+
+#Fields used to pair the rows of a CSV, the document followed by the item within the document
+key_fields = ['Invoice__Number', 'Invoice__BillDetails__Name']
+#Number of mismatching values printed for each performance mode
+num_mismatches_shown = 10
+
+
+
+def run_stage(stats: dict, stage: str, profileMemory: bool, function, *args):
+    """
+    Runs a single stage of the pipeline while recording either its time or its peak memory.
+
+    Args:
+    - stats: Dictionary of per-stage statistics to be updated.
+    - stage: The name of the stage being run.
+    - profileMemory: Whether peak memory is recorded instead of time. Tracing memory slows down
+    every allocation, so the two are never measured in the same pass.
+    - function: The callable implementing the stage.
+    - args: Arguments passed to the callable.
+
+    Returns:
+    - The value returned by the callable.
+    """
+
+    if profileMemory:
+        tracemalloc.reset_peak()
+        memoryBefore = tracemalloc.get_traced_memory()[0]
+        result = function(*args)
+        stats[stage]['memory'] = max(stats[stage]['memory'],
+                                     tracemalloc.get_traced_memory()[1] - memoryBefore)
+    else:
+        start = time.perf_counter()
+        result = function(*args)
+        stats[stage]['time'] += time.perf_counter() - start
+
+    return result
+
+
+def run_mode(extractorClass, outputFilePath: str, stats: dict, profileMemory: bool) -> list:
+    """
+    Runs the pipeline over all the recorded outputs of the API using the given content extractor.
+
+    Args:
+    - extractorClass: The content extractor class implementing the performance mode.
+    - outputFilePath: Path of the CSV where the extracted data will be saved.
+    - stats: Dictionary of per-stage statistics to be updated.
+    - profileMemory: Whether peak memory is recorded instead of time.
+
+    Returns:
+    - dict: Dictionary of the stage, type and message of the error keyed by the name of each 
+    recording which failed. Rows of failed recordings are missing from the output.
+    """
+
+    setup_output_csv(outputFilePath)
+    intermediate = f'{benchmark_folder_path}/temp'
+    failed = dict()
+
+    def unzip(archive):
+        with ZipFile(archive, 'r') as zip:
+            zip.extractall(intermediate)
+
+    if profileMemory:
+        tracemalloc.start()
+
+    #Sorting the recorded outputs keeps the row order stable across modes
+    for filename in sorted(os.listdir(recorded_folder_path)):
+        archive = os.path.join(recorded_folder_path, filename)
+        if not os.path.isfile(archive):
+            continue
+
+        #Removing leftovers of an earlier run so they cannot be merged into this document
+        remove_intermediate(intermediate)
+        stage = None
+        try:
+            stage = 'unzip'
+            run_stage(stats, stage, profileMemory, unzip, archive)
+            stage = 'load'
+            content_extractor = run_stage(stats, stage, profileMemory,
+                                          extractorClass, intermediate)
+            stage = 'extract'
+            run_stage(stats, stage, profileMemory, content_extractor.extract)
+            stage = 'save'
+            run_stage(stats, stage, profileMemory,
+                      content_extractor.save_extracted_content, f'{intermediate}.csv')
+
+            #Rows are only appended once the whole document has been extracted
+            with open(f'{intermediate}.csv', 'r', newline='') as rows, \
+                 open(outputFilePath, 'a', newline='') as output:
+                output.write(rows.read())
+        except Exception as e:
+            failed[filename] = {'stage': stage, 'type': type(e).__name__, 'message': str(e)}
+        finally:
+            remove_intermediate(intermediate)
+
+    if profileMemory:
+        tracemalloc.stop()
+
+    return failed
+
+
+def normalize(value: str) -> str:
+    """
+    Replaces every non-ASCII character with U+FFFD.
+
+    The golden CSV was saved with its non-ASCII characters already replaced by U+FFFD, so the
+    produced values are normalized the same way to compare them irrespective of the platform.
+
+    Args:
+    - value: The value to be normalized.
+
+    Returns:
+    - str: The normalized value.
+    """
+
+    return ''.join(char if ord(char) < 128 else '\ufffd' for char in value)
+
+
+def read_csv(filePath: str, encoding= None) -> tuple:
+    """
+    Reads a CSV file into its headers and normalized rows.
+
+    Args:
+    - filePath: Path of the CSV to be read.
+    - encoding: Optional. Encoding of the CSV. If not provided, the platform default used while
+    writing the output CSVs is used.
+
+    Returns:
+    - tuple: List of headers and list of rows.
+    """
+
+    with open(filePath, 'r', newline='', encoding=encoding) as file:
+        reader = csv.reader(file)
+        headers = next(reader)
+        rows = [tuple(normalize(value) for value in row) for row in reader]
+
+    return headers, rows
+
+
+def key_rows(rows: list, keyIndices: list) -> dict:
+    """
+    Keys every row by its key fields and its occurrence among rows with the same key fields.
+
+    Args:
+    - rows: List of rows of a CSV.
+    - keyIndices: Indices of the fields identifying a row.
+
+    Returns:
+    - dict: Dictionary of rows keyed by (key fields..., occurrence).
+    """
+
+    keyed = dict()
+    occurrences = Counter()
+    for row in rows:
+        key = tuple(row[index] if index < len(row) else None for index in keyIndices)
+        keyed[(*key, occurrences[key])] = row
+        occurrences[key] += 1
+
+    return keyed
+
+
+def compare_with_golden(goldenRows: list, producedRows: list, numFields: int, 
+                        keyIndices: list) -> tuple:
+    """
+    Compares the produced rows against the golden rows value by value.
+
+    Rows are paired on their document and item name, so the comparison does not depend on the 
+    order of the documents or of the items within a document. Rows without a counterpart, 
+    including those whose key fields were extracted wrongly, are wrong in every field.
+
+    Args:
+    - goldenRows: List of rows from the golden CSV.
+    - producedRows: List of rows produced by a performance mode.
+    - numFields: Number of fields in each row.
+    - keyIndices: Indices of the fields identifying a row.
+
+    Returns:
+    - tuple: List of the fraction of correctly extracted values for each field, and list of 
+    (key, field, golden value, produced value) for every value which does not match the golden.
+    """
+
+    golden = key_rows(goldenRows, keyIndices)
+    produced = key_rows(producedRows, keyIndices)
+
+    keys = sorted(golden.keys() | produced.keys(), key=str)
+    if not keys:
+        return [1.0] * numFields, list()
+
+    wrong = [0] * numFields
+    mismatches = list()
+    for key in keys:
+        goldenRow, producedRow = golden.get(key, ()), produced.get(key, ())
+        for field in range(numFields):
+            goldenValue = goldenRow[field] if field < len(goldenRow) else None
+            producedValue = producedRow[field] if field < len(producedRow) else None
+            if goldenValue is None or goldenValue != producedValue:
+                wrong[field] += 1
+                mismatches.append((key, field, goldenValue, producedValue))
+
+    return [1 - count / len(keys) for count in wrong], mismatches
+
+
+def print_report(headers: list, accuracies: dict, stats: dict, mismatches: dict, failures: dict):
+    """
+    Prints the per-field accuracy and per-stage time and memory of every performance mode, 
+    followed by the failed documents and mismatching values of each mode.
+
+    Args:
+    - headers: Names of the fields in the CSV.
+    - accuracies: Dictionary of per-field accuracies keyed by performance mode.
+    - stats: Dictionary of per-stage statistics keyed by performance mode.
+    - mismatches: Dictionary of values which do not match the golden keyed by performance mode.
+    - failures: Dictionary of recordings which failed keyed by performance mode.
+    """
+
+    modes = list(accuracies.keys())
+
+    print(f'\n{"Field":<32}' + ''.join(f'{mode:>16}' for mode in modes))
+    for field, header in enumerate(headers):
+        line = f'{header:<32}'
+        for mode in modes:
+            color = red if accuracies[mode][field] < 1 else reset
+            line += f'{color}{accuracies[mode][field]:>15.2%}{reset} '
+        print(line)
+
+    print(f'\n{"Stage":<32}' + ''.join(f'{mode:>16}' for mode in modes))
+    for stage in stages:
+        print(f'{stage + " (s)":<32}' +
+              ''.join(f'{stats[mode][stage]["time"]:>16.3f}' for mode in modes))
+        print(f'{stage + " (peak KiB)":<32}' +
+              ''.join(f'{stats[mode][stage]["memory"] / 1024:>16.1f}' for mode in modes))
+    print(f'{"failed documents":<32}' + ''.join(f'{len(failures[mode]):>16}' for mode in modes))
+    print()
+
+    for mode in modes:
+        for filename, error in failures[mode].items():
+            print(f'{red}{mode}: {filename} failed [{error["stage"]}] '
+                  f'{error["type"]}: {error["message"]}{reset}')
+        for key, field, goldenValue, producedValue in mismatches[mode][:num_mismatches_shown]:
+            print(f'{red}{mode}: {key} {headers[field]} expected {goldenValue!r}, '
+                  f'got {producedValue!r}{reset}')
+        if len(mismatches[mode]) > num_mismatches_shown:
+            print(f'{red}{mode}: ... and {len(mismatches[mode]) - num_mismatches_shown} '
+                  f'more mismatching values{reset}')
+
+
+
+if __name__ == '__main__':
+
+    if not os.path.isdir(recorded_folder_path) or not os.listdir(recorded_folder_path):
+        print(f'{red}No recorded outputs found at {recorded_folder_path}, '
+              f'build them with: python main.py --record{reset}')
+        sys.exit(1)
+    os.makedirs(benchmark_folder_path, exist_ok=True)
+
+    #The golden CSV only matches a corpus recorded from every input PDF
+    missing = [filename for filename in os.listdir(input_folder_path)
+               if not os.path.isfile(f'{recorded_folder_path}/{filename}.zip')]
+    if missing:
+        print(f'{yellow}{len(missing)} input PDFs have no recorded output, '
+              f'their rows will count as missing{reset}')
+
+    headers, goldenRows = read_csv(golden_file_path, 'utf-8')
+    keyIndices = [headers.index(field) for field in key_fields]
+
+    accuracies = dict()
+    stats = dict()
+    mismatches = dict()
+    failures = dict()
+    for mode, extractorClass in performance_modes.items():
+        print(f'{yellow}Running mode {mode}{reset}')
+        outputFilePath = f'{benchmark_folder_path}/{mode}.csv'
+        stats[mode] = {stage: {'time': 0.0, 'memory': 0} for stage in stages}
+
+        #Timing and memory profiling are done in separate passes, the output of the memory pass
+        #is only scratch as the accuracy is measured on the output of the timing pass
+        failures[mode] = run_mode(extractorClass, outputFilePath, stats[mode], False)
+        scratchFilePath = f'{benchmark_folder_path}/{mode}.memory.csv'
+        run_mode(extractorClass, scratchFilePath, stats[mode], True)
+        os.remove(scratchFilePath)
+
+        _, producedRows = read_csv(outputFilePath)
+        accuracies[mode], mismatches[mode] = compare_with_golden(goldenRows, producedRows, 
+                                                                 len(headers), keyIndices)
+
+    print_report(headers, accuracies, stats, mismatches, failures)
+
+    #A performance mode, 'baseline' included, is only accepted if every value matches the golden
+    failedModes = [mode for mode in performance_modes.keys() if mismatches[mode]]
+    if failedModes:
+        for mode in failedModes:
+            print(f'{red}{mode}: {len(mismatches[mode])} values do not match the golden{reset}')
+        sys.exit(1)
+    print(f'{green}All values match the golden in {len(performance_modes)} mode(s){reset}')
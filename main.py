@@ -1,9 +1,13 @@
+import argparse
 import os
+import shutil
 from zipfile import ZipFile
 
 from src.ContentExtractor import ContentExtractor
+from src.DeadLetterQueue import DeadLetterQueue
+from src.IsolatedWorker import IsolatedWorker
 from src.PDFDataExtractor import PDFDataExtractor
-from src.utils.functions import setup_output_csv, delete_directory as cleanup
+from src.utils.functions import setup_output_csv, remove_intermediate
 from src.utils.colors import *
 
 
@@ -14,45 +18,220 @@ input_folder_path = './res'
 output_folder_path = './out'
 #Path to the output CSV
 output_file_path = f'{output_folder_path}/result.csv'
+#Path to the directory where the raw outputs of the API are cached for retries
+cache_folder_path = './cache'
+#Path to the committed fixture corpus used by benchmark.py, only written by --record
+fixture_folder_path = './tests/golden/recorded'
+#Path to the directory where failed documents are stored along with their errors
+dead_letter_folder_path = './dead_letter'
+#Number of seconds after which processing of a single document is abandoned
+document_timeout = 120
+
+
+
+def record_document(file, filename, intermediate, folder, report_stage):
+    """
+    Records the output of the API for a single PDF. Runs in an isolated process.
+
+    Args:
+    - file: Path to the input PDF.
+    - filename: Name of the input PDF.
+    - intermediate: Path of the intermediate directory used for the document.
+    - folder: Path to the directory where the output of the API is recorded.
+    - report_stage: Callable used to report the stage currently being processed.
+
+    Returns:
+    - str: Path to the recorded output of the API.
+    """
+
+    #Extracting JSON and table data CSVs from the PDF using Adobe ExtractPDF API
+    report_stage('api')
+    pdf_extractor = PDFDataExtractor(file, f'{intermediate}.zip')
+    pdf_extractor.set_credentials('./pdfservices-api-credentials.json')
+    pdf_extractor.initialize_operation()
+    pdf_extractor.set_ExtractPDF_options()
+    pdf_extractor.extract()
+
+    #Recording the output from the API so that the extraction can be rerun offline
+    archive = f'{folder}/{filename}.zip'
+    shutil.copyfile(f'{intermediate}.zip', archive)
+    #Deleting the original zip file
+    pdf_extractor.cleanup()
+
+    return archive
+
+
+def process_document(file, filename, intermediate, archive, report_stage):
+    """
+    Extracts the contents of a single PDF into an intermediate CSV. Runs in an isolated process.
+
+    Args:
+    - file: Path to the input PDF.
+    - filename: Name of the input PDF.
+    - intermediate: Path of the intermediate directory used for the document.
+    - archive: Path to a recorded output of the API. If None, the API is called on the input PDF.
+    - report_stage: Callable used to report the stage currently being processed.
+    """
+
+    if not archive:
+        archive = record_document(file, filename, intermediate, cache_folder_path, report_stage)
+
+    #Unzipping the output from the API to an intermediate directory
+    report_stage('unzip')
+    with ZipFile(archive, 'r') as zip:
+        zip.extractall(intermediate)
+
+    #Extracting contents from the outputs of the API into an intermediate CSV, which is only
+    #appended to the output CSV once the whole document has been processed
+    report_stage('extract')
+    content_extractor = ContentExtractor(f'{intermediate}')
+    content_extractor.extract()
+    report_stage('save')
+    content_extractor.save_extracted_content(f'{intermediate}.csv')
+
+
+def run_document(file, filename, archive, dead_letter_queue, worker):
+    """
+    Processes a single PDF in isolation and routes it to the dead letter queue if it fails.
+
+    Args:
+    - file: Path to the input PDF.
+    - filename: Name of the input PDF.
+    - archive: Path to a recorded output of the API. If None, the API is called on the input PDF.
+    - dead_letter_queue: DeadLetterQueue where failed documents are stored.
+    - worker: IsolatedWorker in which the document is processed.
+
+    Returns:
+    - dict: None if the document was processed, otherwise the dictionary describing the error.
+    """
+
+    intermediate = f'./temp/{filename}'
+    os.makedirs('./temp', exist_ok=True)
+    #Removing leftovers of an interrupted run, whose rows would otherwise be appended again
+    remove_intermediate(intermediate)
+
+    error = worker.run(process_document, (file, filename, intermediate, archive))
+
+    if error is None:
+        #Appending the rows of the document to the output CSV
+        with open(f'{intermediate}.csv', 'r', newline='') as rows, \
+             open(output_file_path, 'a', newline='') as output:
+            shutil.copyfileobj(rows, output)
+    else:
+        if not archive and os.path.isfile(f'{cache_folder_path}/{filename}.zip'):
+            archive = f'{cache_folder_path}/{filename}.zip'
+        dead_letter_queue.add(filename, archive, error)
+
+    #Deleting the intermediate files of the document
+    remove_intermediate(intermediate)
+
+    return error
+
+
+def print_result(index, num_files, filename, error, skipped= False):
+    """
+    Prints the outcome of processing a single PDF.
+
+    Args:
+    - index: Position of the PDF in the batch.
+    - num_files: Number of PDFs in the batch.
+    - filename: Name of the input PDF.
+    - error: Dictionary describing the error, None if the document was processed.
+    - skipped: Optional. Whether the PDF was skipped as there was nothing to process.
+    """
+
+    if skipped:
+        print(f'\r{yellow}{index+1:>4}/{num_files:<4}\t {filename:<13}\t\t Skipped   {reset}')
+    elif error is None:
+        print(f'\r{green}{index+1:>4}/{num_files:<4}\t {filename:<13}\t\t Processed {reset}')
+    else:
+        print(f'\r{red}{index+1:>4}/{num_files:<4}\t {filename:<13}\t\t Failed    '
+              f'[{error["stage"]}] {error["type"]}: {error["message"]}{reset}')
 
 
 
 if __name__ == '__main__':
-    
-    intermediate = './temp'
-    #Setting up the output CSV
-    setup_output_csv(output_file_path)
 
-    num_files = len(os.listdir(input_folder_path))
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--retry', action='store_true',
+                        help='reprocess only the dead lettered documents from their recorded outputs')
+    parser.add_argument('--record', action='store_true',
+                        help='only record the outputs of the API for PDFs without a recording, '
+                             'leaving the output CSV untouched')
+    arguments = parser.parse_args()
+
+    os.makedirs(cache_folder_path, exist_ok=True)
+    #A single worker process is reused for the whole batch, it is only restarted after a 
+    #document times out or crashes it
+    worker = IsolatedWorker(document_timeout)
 
-    #Iterating over files in the input directory
-    for index, filename in enumerate(os.listdir(input_folder_path)):
+    if arguments.record:
+        #Building the offline corpus used by benchmark.py, only calling the API for PDFs which
+        #have no recording yet so existing fixtures never change under the golden CSV
+        os.makedirs(fixture_folder_path, exist_ok=True)
+        os.makedirs('./temp', exist_ok=True)
+        filenames = [filename for filename in os.listdir(input_folder_path)
+                     if os.path.isfile(os.path.join(input_folder_path, filename)) and
+                     not os.path.isfile(f'{fixture_folder_path}/{filename}.zip')]
+        num_failed = 0
+        for index, filename in enumerate(filenames):
+            print(f'{yellow}{index+1:>4}/{len(filenames):<4}\t {filename:<13}\t\t Recording{reset}', end='')
+            remove_intermediate(f'./temp/{filename}')
+            error = worker.run(record_document, (os.path.join(input_folder_path, filename),
+                               filename, f'./temp/{filename}', fixture_folder_path))
+            remove_intermediate(f'./temp/{filename}')
+            num_failed += error is not None
+            print_result(index, len(filenames), filename, error)
+        worker.stop()
+        print(f'Recorded {len(filenames) - num_failed}/{len(filenames)} files to {fixture_folder_path}')
+        raise SystemExit(1 if num_failed else 0)
 
+    dead_letter_queue = DeadLetterQueue(dead_letter_folder_path)
+
+    if arguments.retry:
+        #Retried documents are appended to the output CSV of the previous run
+        if not os.path.isfile(output_file_path):
+            setup_output_csv(output_file_path)
+        filenames = dead_letter_queue.get_items()
+    else:
+        #Setting up the output CSV
+        setup_output_csv(output_file_path)
+        filenames = os.listdir(input_folder_path)
+
+    num_files = len(filenames)
+    num_failed = 0
+    num_skipped = 0
+
+    #Iterating over files in the batch
+    for index, filename in enumerate(filenames):
+
+        if arguments.retry:
+            previous = dead_letter_queue.get_error(filename)
+            print(f'{red}{"":>9}\t {filename:<13}\t\t Previously failed '
+                  f'[{previous["stage"]}] {previous["type"]}: {previous["message"]}{reset}')
         print(f'{yellow}{index+1:>4}/{num_files:<4}\t {filename:<13}\t\t Processing{reset}', end='')
-        
+
         file = os.path.join(input_folder_path, filename)
-        if os.path.isfile(file):
-
-            #Extracting JSON and table data CSVs from the PDF using Adobe ExtractPDF API
-            pdf_extractor = PDFDataExtractor(file, f'{intermediate}.zip')
-            pdf_extractor.set_credentials('./pdfservices-api-credentials.json')
-            pdf_extractor.initialize_operation()
-            pdf_extractor.set_ExtractPDF_options()
-            pdf_extractor.extract()
-
-            #Unzipping the output from the API to an intermediate directory
-            with ZipFile(f'{intermediate}.zip', 'r') as zip:
-                zip.extractall(intermediate)
-            #Deleting the original zip file
-            pdf_extractor.cleanup()
-
-            #Extracting contents from the outputs of the API
-            content_extractor = ContentExtractor(f'{intermediate}')
-            content_extractor.extract()
-            content_extractor.save_extracted_content(output_file_path)
-            #Deleting the intermediate directory with contents
-            cleanup(intermediate)
+        archive = dead_letter_queue.get_archive(filename) if arguments.retry else None
+        if archive or os.path.isfile(file):
 
-        print(f'\r{green}{index+1:>4}/{num_files:<4}\t {filename:<13}\t\t Processed {reset}')
-    
-    print(f'All {num_files} files extracted successfully!')
\ No newline at end of file
+            error = run_document(file, filename, archive, dead_letter_queue, worker)
+            if error is None:
+                dead_letter_queue.remove(filename)
+            num_failed += error is not None
+            print_result(index, num_files, filename, error)
+
+        else:
+            #Nothing to process, neither a recorded output nor the input PDF is available
+            num_skipped += 1
+            print_result(index, num_files, filename, None, skipped= True)
+
+    worker.stop()
+
+    if num_skipped:
+        print(f'{yellow}{num_skipped}/{num_files} files skipped as there was nothing to process{reset}')
+    if num_failed:
+        print(f'{red}{num_failed}/{num_files} files failed, '
+              f'see {dead_letter_folder_path} and rerun with --retry{reset}')
+    elif not num_skipped:
+        print(f'All {num_files} files extracted successfully!')
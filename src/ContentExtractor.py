@@ -111,31 +111,44 @@ class ContentExtractor:
 
         Returns:
         - dict: Dictionary containing the extracted customer details.
+
+        Raises:
+        - Exception: If any of the customer details is missing from the customer data.
         """
 
         #The text in the customer region contains the 'BILL TO ' substring which is not required
+        if 'BILL TO ' not in customerData:
+            raise Exception("'BILL TO ' not found in the customer region")
         customerData.remove('BILL TO ')
         
+        if not customerData:
+            raise Exception('Customer name not found in the customer region')
         name = customerData[0].strip()
         customerData = customerData[1:]
         #Accounting for longer names which may get split into multiple lines on the PDF
         #name is followed by email which'll include an '@' symbol
-        while(not re.search('@', customerData[0])):
+        while(customerData and not re.search('@', customerData[0])):
             name += customerData[0].strip()
             customerData = customerData[1:]
 
+        if not customerData:
+            raise Exception('Customer email not found in the customer region')
         email = customerData[0].strip()
         customerData = customerData[1:]
         #Accounting for longer emails which may get split into multiple lines on the PDF
         #email is followed by phone number which'll include '-' symbols
-        while(not re.search('-', customerData[0])):
+        while(customerData and not re.search('-', customerData[0])):
             email += customerData[0].strip()
             customerData = customerData[1:]
 
+        if not customerData:
+            raise Exception('Customer phone number not found in the customer region')
         #Extracting the phone number
         phone = customerData[0]
         customerData = customerData[1:]
 
+        if len(customerData) < 2:
+            raise Exception('Customer address not found in the customer region')
         #Extracting address lines
         addressLine1, addressLine2 = customerData[0], customerData[1]
         
@@ -159,6 +172,9 @@ class ContentExtractor:
 
         Returns:
         - dict: Dictionary containing the extracted invoice details.
+
+        Raises:
+        - Exception: If the due date or the issue date is missing from the invoice data.
         """
 
         #The text in the invoice region may contain the 'DETAILS ' substring which is not required
@@ -168,13 +184,17 @@ class ContentExtractor:
 
         #Extracting the due date using regular expressions
         dueDate = ''.join(dueDate)
-        dueDate = re.search('[0-9]{2}-[0-9]{2}-[0-9]{4}', dueDate) \
-            .group()
+        dueDateMatch = re.search('[0-9]{2}-[0-9]{2}-[0-9]{4}', dueDate)
+        if not dueDateMatch:
+            raise Exception('Due date not found in the invoice region')
+        dueDate = dueDateMatch.group()
 
         #Extracting the issue date using regular expressions
         numberAndIssueDate = ''.join(numberAndIssueDate)
-        issueDate = re.search('[0-9]{2}-[0-9]{2}-[0-9]{4}', numberAndIssueDate) \
-            .group()
+        issueDateMatch = re.search('[0-9]{2}-[0-9]{2}-[0-9]{4}', numberAndIssueDate)
+        if not issueDateMatch:
+            raise Exception('Issue date not found in the invoice region')
+        issueDate = issueDateMatch.group()
         
         #Replacing the following substring with blank strings leaves us with the invoice number
         numberAndIssueDate = numberAndIssueDate.replace(issueDate, '') \
@@ -271,6 +291,9 @@ class ContentExtractor:
         
         Args:
         - outputFilePath: Path of the CSV where the data needs to be appended/saved.
+
+        Raises:
+        - Exception: If no bill table was found while extracting the content.
         """
 
         #Extracting all business details
@@ -285,6 +308,8 @@ class ContentExtractor:
         customerData = self.region_content_extractor.get_customer_data()
         customer_details = self.__get_customer_details(customerData)
 
+        if self.tables_name is None:
+            raise Exception('Bill table not found in the extracted data')
         for table in self.tables_name:
             self.bill_table = pd.read_csv(f'{self.folder_path}/{table}', header=None, dtype=str)
             #Iterating over item rows in the invoice
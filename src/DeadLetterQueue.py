@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import time
+
+from src.utils.functions import delete_directory
+
+
+
+class DeadLetterQueue:
+
+
+    def __init__(self, folder):
+        """
+        Initializes the DeadLetterQueue object.
+
+        Args:
+        - folder: The folder path where the failed documents are stored, one directory per document.
+        """
+
+        self.folder_path = folder
+        os.makedirs(self.folder_path, exist_ok=True)
+
+
+    def add(self, filename: str, archive: str, error: dict):
+        """
+        Adds a failed document to the queue along with the raw output of the API and its error.
+        An existing entry for the same document is updated with the new error.
+
+        Args:
+        - filename: Name of the input PDF which failed.
+        - archive: Path to the ZIP file output by the API. None if the API call itself failed.
+        - error: Dictionary describing the error, as returned by IsolatedWorker.run.
+        """
+
+        entry = f'{self.folder_path}/{filename}'
+        os.makedirs(entry, exist_ok=True)
+
+        #The error is written first and renamed into place, so an interrupted add never leaves an
+        #entry without a complete error.json
+        error = dict(error)
+        error['file'] = filename
+        error['time'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        with open(f'{entry}/error.json.tmp', 'w') as file:
+            json.dump(error, file, indent=4)
+        os.replace(f'{entry}/error.json.tmp', f'{entry}/error.json')
+
+        #Keeping the raw output of the API so the document can be retried offline
+        if archive and os.path.isfile(archive) and \
+           os.path.abspath(archive) != os.path.abspath(f'{entry}/output.zip'):
+            shutil.copyfile(archive, f'{entry}/output.zip.tmp')
+            os.replace(f'{entry}/output.zip.tmp', f'{entry}/output.zip')
+
+
+    def get_items(self) -> list:
+        """
+        Returns the names of all the documents present in the queue. Entries whose error was never
+        written, because adding them was interrupted, are left out.
+
+        Returns:
+        - list: Names of the input PDFs which failed.
+        """
+
+        return sorted(name for name in os.listdir(self.folder_path) \
+                      if os.path.isfile(f'{self.folder_path}/{name}/error.json'))
+
+
+    def get_archive(self, filename: str):
+        """
+        Returns the raw output of the API for a failed document.
+
+        Args:
+        - filename: Name of the input PDF which failed.
+
+        Returns:
+        - str: Path to the ZIP file output by the API, None if it was never recorded.
+        """
+
+        archive = f'{self.folder_path}/{filename}/output.zip'
+        return archive if os.path.isfile(archive) else None
+
+
+    def get_error(self, filename: str) -> dict:
+        """
+        Returns the structured error recorded for a failed document.
+
+        Args:
+        - filename: Name of the input PDF which failed.
+
+        Returns:
+        - dict: Dictionary describing the error.
+        """
+
+        with open(f'{self.folder_path}/{filename}/error.json') as file:
+            return json.load(file)
+
+
+    def remove(self, filename: str):
+        """
+        Removes a document from the queue along with its recorded output and error.
+
+        Args:
+        - filename: Name of the input PDF to be removed.
+        """
+
+        entry = f'{self.folder_path}/{filename}'
+        if os.path.isdir(entry):
+            delete_directory(entry)
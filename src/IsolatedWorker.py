@@ -0,0 +1,154 @@
+import multiprocessing
+import time
+import traceback
+
+
+
+def _serve(tasks, messages):
+    """
+    Runs the tasks sent by the parent process one after the other, reporting their progress.
+
+    Args:
+    - tasks: Queue of (target, args) tuples to be run. None stops the worker.
+    - messages: Connection used to send the progress and outcome of each task to the parent 
+    process. Sending over a pipe is synchronous, so the last stage reported is never lost when
+    the process crashes.
+    """
+
+    def report_stage(stage):
+        messages.send(('stage', stage))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+
+        target, args = task
+        try:
+            target(*args, report_stage)
+            messages.send(('done', None))
+        except Exception as e:
+            messages.send(('error', {
+                'type': type(e).__name__,
+                'message': str(e),
+                'traceback': traceback.format_exc()
+            }))
+
+
+
+class IsolatedWorker:
+
+
+    def __init__(self, timeout):
+        """
+        Initializes the IsolatedWorker object. The worker process is started on the first task and
+        reused for every following task, it is only restarted after a timeout or a crash.
+
+        Args:
+        - timeout: Number of seconds after which a task is abandoned and the process terminated.
+        """
+
+        self.timeout = timeout
+        self.process = None
+        self.tasks = None
+        self.messages = None
+
+
+    def __start(self):
+        """
+        Starts a new worker process along with fresh queues to communicate with it.
+        """
+
+        self.tasks = multiprocessing.Queue()
+        self.messages, sender = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(target=_serve, args=(self.tasks, sender),
+                                               daemon=True)
+        self.process.start()
+        #Closing the parent's copy of the sending end so a crash of the process ends the pipe
+        sender.close()
+
+
+    def run(self, target, args) -> dict:
+        """
+        Runs a function in the worker process so that its failures cannot affect the caller.
+
+        Args:
+        - target: The function to be run. It must be defined at module level and accept a callable
+        as its last argument, which it calls with the name of every stage it starts.
+        - args: Tuple of arguments passed to the function before the stage reporting callable.
+
+        Returns:
+        - dict: None if the function completed, otherwise a dictionary with the stage, type, message
+        and traceback of the error.
+        """
+
+        if self.process is None or not self.process.is_alive():
+            self.__start()
+        self.tasks.put((target, args))
+
+        #Collecting the progress of the task until it reports its outcome, the process dies or
+        #the task times out
+        deadline = time.monotonic() + self.timeout
+        stage = None
+        outcome = None
+        crashed = False
+        while outcome is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not self.messages.poll(min(remaining, 0.5)):
+                if not self.process.is_alive():
+                    crashed = True
+                    break
+                continue
+            try:
+                kind, value = self.messages.recv()
+            except EOFError:
+                crashed = True
+                break
+            if kind == 'stage':
+                stage = value
+            else:
+                outcome = (kind, value)
+
+        if outcome is not None:
+            error = outcome[1]
+        else:
+            if not crashed:
+                self.process.terminate()
+                error = {
+                    'type': 'TimeoutError',
+                    'message': f'Processing did not complete within {self.timeout} seconds',
+                    'traceback': None
+                }
+            else:
+                self.process.join()
+                error = {
+                    'type': 'ProcessError',
+                    'message': f'Process exited unexpectedly with exit code {self.process.exitcode}',
+                    'traceback': None
+                }
+            #The process is discarded and a new one is started for the next task
+            self.stop()
+
+        if error is None:
+            return None
+        return {'stage': stage, **error}
+
+
+    def stop(self):
+        """
+        Stops the worker process, terminating it if it does not exit on its own.
+        """
+
+        if self.process is None:
+            return
+
+        if self.process.is_alive():
+            self.tasks.put(None)
+            self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.messages.close()
+        self.process = None
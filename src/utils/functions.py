@@ -60,4 +60,19 @@ def delete_directory(directory_path):
         for dir_name in dirs:
             dir_path = os.path.join(root, dir_name)
             os.rmdir(dir_path)
-    os.rmdir(directory_path)
\ No newline at end of file
+    os.rmdir(directory_path)
+
+
+def remove_intermediate(intermediate):
+    """
+    Deletes the intermediate directory, ZIP and CSV used while processing a single document.
+
+    Args:
+    - intermediate: The path to the intermediate directory used for the document.
+    """
+
+    for path in [f'{intermediate}.zip', f'{intermediate}.csv']:
+        if os.path.isfile(path):
+            os.remove(path)
+    if os.path.isdir(intermediate):
+        delete_directory(intermediate)
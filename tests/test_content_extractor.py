@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from src.ContentExtractor import ContentExtractor
+
+
+
+customerData = [
+    'BILL TO ',
+    'Willis Koelpin ',
+    'Willis_Koelpin4@yahoo.com ',
+    '783-402-5895 ',
+    '353 Cara Shoals ',
+    'Suchitlan '
+]
+
+
+@pytest.fixture
+def content_extractor(tmp_path):
+    with open(tmp_path / 'structuredData.json', 'w') as file:
+        json.dump({'elements': []}, file)
+    return ContentExtractor(str(tmp_path))
+
+
+def get_customer_details(content_extractor, data):
+    return content_extractor._ContentExtractor__get_customer_details(list(data))
+
+
+def test_customer_details(content_extractor):
+    assert get_customer_details(content_extractor, customerData) == {
+        'Address__line1': '353 Cara Shoals',
+        'Address__line2': 'Suchitlan',
+        'Email': 'Willis_Koelpin4@yahoo.com',
+        'Name': 'Willis Koelpin',
+        'PhoneNumber': '783-402-5895'
+    }
+
+
+def test_customer_details_without_bill_to(content_extractor):
+    with pytest.raises(Exception, match="'BILL TO ' not found"):
+        get_customer_details(content_extractor, customerData[1:])
+
+
+def test_customer_details_without_email(content_extractor):
+    with pytest.raises(Exception, match='email not found'):
+        get_customer_details(content_extractor, customerData[:2])
+
+
+def test_customer_details_without_phone_number(content_extractor):
+    with pytest.raises(Exception, match='phone number not found'):
+        get_customer_details(content_extractor, customerData[:3])
+
+
+def test_customer_details_without_address(content_extractor):
+    with pytest.raises(Exception, match='address not found'):
+        get_customer_details(content_extractor, customerData[:5])
+
+
+def test_save_without_bill_table(content_extractor, tmp_path):
+    content_extractor.business_name = 'NearBy Electronics'
+    content_extractor.region_content_extractor.region_contents['businessAddress'] = \
+        ['NearBy Electronics 3741 Glory Road, Jamestown, Tennessee, USA 38556 ']
+    content_extractor.region_content_extractor.region_contents['customerDetails'] = \
+        list(customerData)
+
+    with pytest.raises(Exception, match='Bill table not found'):
+        content_extractor.save_extracted_content(str(tmp_path / 'result.csv'))
@@ -0,0 +1,56 @@
+import os
+
+from src.DeadLetterQueue import DeadLetterQueue
+
+
+
+error = {'stage': 'extract', 'type': 'ValueError', 'message': 'boom', 'traceback': None}
+
+
+def test_add_get_remove_round_trip(tmp_path):
+    archive = tmp_path / 'output0.pdf.zip'
+    archive.write_bytes(b'zip')
+    queue = DeadLetterQueue(str(tmp_path / 'dead_letter'))
+
+    queue.add('output0.pdf', str(archive), error)
+
+    assert queue.get_items() == ['output0.pdf']
+    with open(queue.get_archive('output0.pdf'), 'rb') as file:
+        assert file.read() == b'zip'
+    recorded = queue.get_error('output0.pdf')
+    assert recorded['file'] == 'output0.pdf'
+    assert recorded['type'] == 'ValueError'
+    assert recorded['message'] == 'boom'
+
+    queue.remove('output0.pdf')
+
+    assert queue.get_items() == []
+    assert queue.get_archive('output0.pdf') is None
+
+
+def test_add_without_archive(tmp_path):
+    queue = DeadLetterQueue(str(tmp_path / 'dead_letter'))
+
+    queue.add('output0.pdf', None, error)
+
+    assert queue.get_items() == ['output0.pdf']
+    assert queue.get_archive('output0.pdf') is None
+
+
+def test_readding_keeps_archive_and_updates_error(tmp_path):
+    archive = tmp_path / 'output0.pdf.zip'
+    archive.write_bytes(b'zip')
+    queue = DeadLetterQueue(str(tmp_path / 'dead_letter'))
+    queue.add('output0.pdf', str(archive), error)
+
+    queue.add('output0.pdf', queue.get_archive('output0.pdf'), dict(error, message='again'))
+
+    assert queue.get_error('output0.pdf')['message'] == 'again'
+    assert queue.get_archive('output0.pdf') is not None
+
+
+def test_entry_without_error_is_not_listed(tmp_path):
+    queue = DeadLetterQueue(str(tmp_path / 'dead_letter'))
+    os.makedirs(tmp_path / 'dead_letter' / 'output0.pdf')
+
+    assert queue.get_items() == []
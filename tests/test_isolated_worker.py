@@ -0,0 +1,86 @@
+import os
+import time
+
+from src.IsolatedWorker import IsolatedWorker
+
+
+
+def complete(report_stage):
+    report_stage('first')
+
+
+def raise_error(report_stage):
+    report_stage('remove')
+    [].remove('BILL TO ')
+
+
+def sleep(report_stage):
+    report_stage('sleep')
+    time.sleep(10)
+
+
+def crash(report_stage):
+    report_stage('crash')
+    os._exit(3)
+
+
+def get_pid(path, report_stage):
+    with open(path, 'a') as file:
+        file.write(f'{os.getpid()}\n')
+
+
+def run(target, args= (), timeout= 5):
+    worker = IsolatedWorker(timeout)
+    try:
+        return worker.run(target, args)
+    finally:
+        worker.stop()
+
+
+def test_completed_task_returns_none():
+    assert run(complete) is None
+
+
+def test_exception_is_reported_with_stage():
+    error = run(raise_error)
+
+    assert error['stage'] == 'remove'
+    assert error['type'] == 'ValueError'
+    assert 'list.remove' in error['message']
+    assert 'Traceback' in error['traceback']
+
+
+def test_timeout_terminates_task():
+    start = time.monotonic()
+    error = run(sleep, timeout=1)
+
+    assert time.monotonic() - start < 5
+    assert error['stage'] == 'sleep'
+    assert error['type'] == 'TimeoutError'
+
+
+def test_crash_is_reported():
+    error = run(crash)
+
+    assert error['stage'] == 'crash'
+    assert error['type'] == 'ProcessError'
+    assert 'exit code 3' in error['message']
+
+
+def test_process_is_reused_and_restarted_after_failure(tmp_path):
+    path = str(tmp_path / 'pids')
+    worker = IsolatedWorker(5)
+    try:
+        assert worker.run(get_pid, (path,)) is None
+        assert worker.run(raise_error, ()) is not None
+        assert worker.run(get_pid, (path,)) is None
+        assert worker.run(crash, ()) is not None
+        assert worker.run(get_pid, (path,)) is None
+    finally:
+        worker.stop()
+
+    with open(path) as file:
+        pids = file.read().split()
+    #An exception keeps the process, a crash replaces it
+    assert pids[0] == pids[1]
+    assert pids[1] != pids[2]